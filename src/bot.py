@@ -4,11 +4,47 @@ recording the results.
 Currently only functional for the ReversiStub class.
 """
 import sys
-from reversi import Reversi
-from typing import Tuple
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from reversi import Reversi, ListMovesType
+from typing import Callable, Dict, List, Optional, Tuple
 import random
 import click
-import numpy as np
+
+TT_SIZE = 1_000_000
+"""
+Maximum number of positions kept in the transposition table
+"""
+
+EXACT, LOWER, UPPER = 0, 1, 2
+"""
+Flags for scores in the transposition table: the exact score of a position,
+or a lower or upper bound on it left by an alpha-beta cutoff
+"""
+
+TT: Dict[Tuple[int, int, int], Tuple[float, int]] = {}
+"""
+Transposition table mapping (position hash, search depth, player) to the
+score the search gave that position for that player and the score's flag,
+shared across moves and games
+"""
+
+def store_score(key: Tuple[int, int, int], score: float, flag: int) -> None:
+    """
+    Stores a score in the transposition table, evicting the oldest entry
+    if the table is full
+    
+    Parameters:
+        key[Tuple[int, int, int]]: position hash, search depth and player
+        score[float]: score of the position
+        flag[int]: EXACT, LOWER or UPPER
+    
+    Returns: nothing
+    """
+    if len(TT) >= TT_SIZE:
+        del TT[next(iter(TT))]
+    TT[key] = (score, flag)
 
 def choose_random_move(revers: Reversi) -> Tuple[int, int]:
     """
@@ -21,6 +57,29 @@ def choose_random_move(revers: Reversi) -> Tuple[int, int]:
     """
     return random.choice(revers.available_moves)
 
+def score_moves(revers: Reversi, moves: ListMovesType,
+                player: int) -> List[int]:
+    """
+    Scores moves available to the current player by how many pieces a given
+    player would have after each of them, without applying any of them to
+    the game. The current player gains the placed piece and the flipped
+    pieces, while any other player only loses those of their pieces that
+    get flipped.
+    
+    Parameters:
+        revers[Reversi]: a reversi game
+        moves[ListMovesType]: moves available to the current player
+        player[int]: the player whose pieces are counted
+        
+    Returns[List[int]]: the score of each move, in the same order
+    """
+    pieces = revers.piece_count(player)
+    if player == revers.turn:
+        return [pieces + 1 + revers.flips(move).bit_count() for move in moves]
+
+    own = revers.bitboard(player)
+    return [pieces - (revers.flips(move) & own).bit_count() for move in moves]
+
 def choose_high_n_move(revers: Reversi) -> Tuple[int, int]:
     """
     Chooses the move that will take the most pieces in a Reversi game
@@ -30,54 +89,122 @@ def choose_high_n_move(revers: Reversi) -> Tuple[int, int]:
         
     Returns[Tuple[int, int]]: coordinates corresponding to a move
     """
-    move_n = {}
-    for move in revers.available_moves:
-        revers.apply_move(move)
-        _, counts = np.unique(revers.grid, return_counts=True)
-        try:
-            move_n[move] = counts[2]
-        except IndexError:
-            move_n[move] = counts[1]
-        revers.roll_back()
+    moves = revers.available_moves
+    scores = score_moves(revers, moves, revers.turn)
+
+    return moves[scores.index(max(scores))]
+
+def alpha_beta(revers: Reversi, depth: int, alpha: float, beta: float,
+               player: int) -> float:
+    """
+    Scores a position by searching the moves after it with alpha-beta
+    pruning. The player maximizes their piece count and every other player
+    minimizes it. Moves are tried in order of how many pieces they take, so
+    that good moves are seen first and more of the rest can be skipped.
+    
+    Parameters:
+        revers[Reversi]: a reversi game, left unchanged
+        depth[int]: number of moves to look ahead
+        alpha[float], beta[float]: the window of scores still of interest
+        player[int]: the player whose pieces are counted
         
+    Returns[float]: the score of the position, or a bound on it if it lies
+    outside the window
+    """
+    key = (revers.zhash, depth, player)
+    if key in TT:
+        score, flag = TT[key]
+        if flag == EXACT:
+            return score
+        if flag == LOWER:
+            alpha = max(alpha, score)
+        else:
+            beta = min(beta, score)
+        if alpha >= beta:
+            return score
+
+    moves = revers.available_moves
+    if depth == 0 or not moves:
+        return revers.piece_count(player)
 
+    maximizing = revers.turn == player
+    if depth > 1:
+        scores = score_moves(revers, moves, revers.turn)
+        moves = [move for _, move in sorted(zip(scores, moves),
+                                            key=lambda x: -x[0])]
 
-    return max(move_n, key= lambda x: move_n[x])
+    alpha_orig, beta_orig = alpha, beta
+    best = float("-inf") if maximizing else float("inf")
+    for move in moves:
+        if depth == 1:
+            # Last move: count the pieces without applying it
+            score = score_moves(revers, [move], player)[0]
+        else:
+            revers.apply_move(move)
+            score = alpha_beta(revers, depth - 1, alpha, beta, player)
+            revers.roll_back()
+
+        if maximizing:
+            best = max(best, score)
+            alpha = max(alpha, best)
+        else:
+            best = min(best, score)
+            beta = min(beta, best)
+        if alpha >= beta:
+            break
+
+    if best <= alpha_orig:
+        store_score(key, best, UPPER)
+    elif best >= beta_orig:
+        store_score(key, best, LOWER)
+    else:
+        store_score(key, best, EXACT)
+    return best
 
 def choose_high_m_move(revers: Reversi) -> Tuple[int, int]:
     """
     Chooses the move that will take the most pieces and retain them 
-    after the next turn in a Reversi game
+    after the next turn in a Reversi game, assuming the next player
+    replies with the move that takes back the most of them
     
     Parameters:
         revers[Reversi]: a reversi game
         
     Returns[Tuple[int, int]]: coordinates corresponding to a move
     """
-    move_m = {}
+    player = revers.turn
+    moves = revers.available_moves
+    scores = score_moves(revers, moves, player)
 
-    for move in revers.available_moves:
+    best_move = moves[0]
+    alpha = float("-inf")
+    for _, move in sorted(zip(scores, moves), key=lambda x: -x[0]):
         revers.apply_move(move)
-        possible_m_list = []
-        for mov in revers.available_moves:
-            revers.apply_move(mov)
-            _, counts = np.unique(revers.grid, return_counts=True)
-            try:
-                possible_m_list.append(counts[2])
-            except IndexError:
-                possible_m_list.append(counts[1])
-            revers.roll_back()
+        score = alpha_beta(revers, 1, alpha, float("inf"), player)
         revers.roll_back()
 
-        if len(possible_m_list) > 0:
-            move_m[move] = sum(possible_m_list) / len(possible_m_list)
-        else:
-            move_m[move] = 64
+        if score > alpha:
+            alpha = score
+            best_move = move
 
-    
-    return max(move_m, key= lambda x: move_m[x])
+    return best_move
 
 
+STRATS: Dict[str, Callable[[Reversi], Tuple[int, int]]] = {
+    "random": choose_random_move,
+    "smart": choose_high_n_move,
+    "very-smart": choose_high_m_move,
+}
+"""
+Maps the name of each strategy a bot can play with to the function that
+chooses its moves
+"""
+
+_GAME: Optional[Reversi] = None
+"""
+The game this process plays on, created by its first call to play_game
+"""
+
 def play_game(player1, player2) -> str:
     """
     Simulates a game of Reversi between two bots
@@ -86,23 +213,20 @@ def play_game(player1, player2) -> str:
     
     Returns [str]: "Player X wins" where x is the winning player or "Tie"
     """
-    game = Reversi(side=8, players=2, othello=False)
+    # Each worker process plays all of its games on the same object
+    global _GAME
+    if _GAME is None:
+        _GAME = Reversi(side=8, players=2, othello=False)
+    else:
+        _GAME.reset()
+    game = _GAME
+
+    # Look up each player's strategy once instead of on every move
+    strategy1 = STRATS[player1]
+    strategy2 = STRATS[player2]
 
     while not game.done:
-        if game.turn == 1:
-            if player1 == "random":
-                move = choose_random_move(game)
-            if player1 == "smart":
-                move = choose_high_n_move(game)
-            if player1 == "very-smart":
-                move = choose_high_m_move(game)
-        elif game.turn == 2:
-            if player2 == "random":
-                move = choose_random_move(game)
-            if player2 == "smart":
-                move = choose_high_n_move(game)
-            if player2 == "very-smart":
-                move = choose_high_m_move(game)
+        move = strategy1(game) if game.turn == 1 else strategy2(game)
 
         game.apply_move(move)
         game.check_for_dead_moves()
@@ -113,24 +237,40 @@ def play_game(player1, player2) -> str:
     return f"Player {winning_player} wins"
 
 
+def seed_worker() -> None:
+    """
+    Reseeds the random module in a worker process, so that workers forked
+    from the same parent don't all play the same random games
+    
+    Parameters: none
+    
+    Returns: nothing
+    """
+    random.seed(os.getpid() ^ time.time_ns())
+
+
+
+STRATEGY_CHOICE = click.Choice(list(STRATS))
+"""
+Strategies a bot can play with, shared by both player options
+"""
 
 @click.command("banner")
 @click.option("-n", "--num_games", default="100")
-@click.option("-1", "--player1", 
-              type=click.Choice(["random", "smart", "very-smart"]), 
-              default="random")
-@click.option("-2", "--player2", 
-              type=click.Choice(["random", "smart", "very-smart"]), 
-              default="random")
+@click.option("-1", "--player1", type=STRATEGY_CHOICE, default="random")
+@click.option("-2", "--player2", type=STRATEGY_CHOICE, default="random")
 
 def cmd(num_games, player1, player2):
     NUM_GAMES = int(num_games)
-    games_played = 0
     results = {"Player 1 wins": 0, "Player 2 wins": 0, "Tie": 0}
 
-    while games_played < NUM_GAMES:
-        results[play_game(player1, player2)] += 1
-        games_played += 1
+    # Games are independent, so they are spread over one process per core
+    chunksize = max(1, NUM_GAMES // (8 * (os.cpu_count() or 1)))
+    with ProcessPoolExecutor(initializer=seed_worker) as executor:
+        for result in executor.map(play_game, [player1] * NUM_GAMES,
+                                   [player2] * NUM_GAMES,
+                                   chunksize=chunksize):
+            results[result] += 1
 
     for key, value in results.items():
         percentage = value / NUM_GAMES * 100
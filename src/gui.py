@@ -1,5 +1,5 @@
 import sys
-from typing import List, Optional, Tuple, Set, Callable
+from typing import Dict, List, Optional, Tuple, Set, Callable
 from reversi import Reversi
 
 import pygame
@@ -11,6 +11,8 @@ pygame.init()
 white = (255, 255, 255)
 green = (0, 255, 0)
 blue = (0, 0, 128)
+grey = (211, 211, 211)
+player_colors = [(255, 0, 0), (0, 0, 0), (0, 255, 0), (0, 0, 255), (255, 215, 0), (191,62,255), (0, 238, 238), (255, 52, 179), (205, 186, 150)]
 
 @click.command()
 @click.option('-n', '--num_players', default=2, show_default=True, type=int,
@@ -28,8 +30,16 @@ class ReversiGUI:
     border : int
     grid : List[List[bool]]
     surface : pygame.surface.Surface
-    clock : pygame.time.Clock
+    background : pygame.surface.Surface
+    square : int
+    cell_corners : List[List[Tuple[int, int]]]
+    board_rect : pygame.Rect
+    piece_sprites : List[pygame.surface.Surface]
+    move_sprite : pygame.surface.Surface
+    font : pygame.font.Font
+    text_cache : Dict[Tuple[str, Tuple[int, int, int]], pygame.surface.Surface]
     reversi : Reversi
+    dirty : bool
 
     def __init__(self, num_players: int = 2, board_size: int = 8, othello : bool = False, window: int = 600, border: int = 10,
                  cells_side: int = 32):
@@ -54,7 +64,21 @@ class ReversiGUI:
         pygame.display.set_caption("BitEdit")
         self.surface = pygame.display.set_mode((window + 12 * border + cells_side,
                                                 window))
-        self.clock = pygame.time.Clock()
+
+        self.square = (window - 2 * border) // board_size
+        self.cell_corners = [[(border + col * self.square,
+                               border + row * self.square)
+                              for col in range(board_size)]
+                             for row in range(board_size)]
+        self.board_rect = pygame.Rect(border, border, board_size * self.square,
+                                      board_size * self.square)
+        self.piece_sprites = [self.draw_sprite(color, self.square // 3, 10)
+                              for color in player_colors]
+        self.move_sprite = self.draw_sprite(grey, self.square / 2.5, 10)
+        self.background = self.draw_background()
+        self.font = pygame.font.Font('freesansbold.ttf', 20)
+        self.text_cache = {}
+        self.dirty = True
 
         try:
             pygame.mixer.init()
@@ -67,75 +91,102 @@ class ReversiGUI:
 
         self.event_loop()
 
-    def draw_window(self) -> None:
+    def draw_background(self) -> pygame.surface.Surface:
         """
-        Draws the contents of the window
+        Draws the parts of the window that never change (the grey
+        background and the empty board) onto a surface, so that they can be
+        copied onto the window in one go instead of being redrawn every frame
 
         Parameters: none beyond self
 
-        Returns: nothing
+        Returns: the background surface
         """
-        cells_side = len(self.reversi.grid)
+        background = pygame.Surface(self.surface.get_size())
 
-        self.surface.fill((128, 128, 128))
+        background.fill((128, 128, 128))
 
-        square = (self.window - 2 * self.border) // cells_side
-
-        for row in range(len(self.reversi.grid)):
-            for col in range(len(self.reversi.grid[row])):
-                rect = (self.border + col * square,
-                        self.border + row * square,
-                        square, square)
-                fill = (255, 255, 255)
-                pygame.draw.rect(self.surface, color=fill,
+        for row in self.cell_corners:
+            for x, y in row:
+                rect = (x, y, self.square, self.square)
+                pygame.draw.rect(background, color=white,
                                  rect=rect)
-                pygame.draw.rect(self.surface, color=(0, 0, 0),
+                pygame.draw.rect(background, color=(0, 0, 0),
                                      rect=rect, width=1)
 
-        player_colors = [(255, 0, 0), (0, 0, 0), (0, 255, 0), (0, 0, 255), (255, 215, 0), (191,62,255), (0, 238, 238), (255, 52, 179), (205, 186, 150)]
-        for row in range(len(self.reversi.grid)):
-            for col in range(len(self.reversi.grid[row])):   
-                if self.reversi.grid[row][col]:
-                    color = self.reversi.grid[row][col] - 1
-                    pygame.draw.circle(self.surface, color=player_colors[color],
-                           center=(self.border + col * square + square / 2, self.border + row * square + square /2), radius=cells_side * 3,
-                           width=10)
+        return background
+
+    def draw_sprite(self, color: Tuple[int, int, int], radius: float,
+                    width: int) -> pygame.surface.Surface:
+        """
+        Draws a ring centered in a transparent cell-sized surface, so that it
+        can be copied onto any cell of the board
+
+        Parameters:
+            color : Tuple[int, int, int] : color of the ring
+            radius : float : outer radius of the ring
+            width : int : thickness of the ring
+
+        Returns: the sprite surface
+        """
+        sprite = pygame.Surface((self.square, self.square), pygame.SRCALPHA)
+        pygame.draw.circle(sprite, color=color,
+                           center=(self.square / 2, self.square / 2),
+                           radius=radius, width=width)
+        return sprite
+
+    def draw_window(self) -> None:
+        """
+        Draws the contents of the window
+
+        Parameters: none beyond self
+
+        Returns: nothing
+        """
+        self.surface.blit(self.background, (0, 0))
+
+        pieces = []
+        for row, corners in zip(self.reversi.grid, self.cell_corners):
+            for player, corner in zip(row, corners):
+                if player:
+                    pieces.append((self.piece_sprites[player - 1], corner))
+        self.surface.blits(pieces)
         
         if self.reversi.done != True:
             pygame.display.set_caption('Reversi')
-            font = pygame.font.Font('freesansbold.ttf', 20)
-            text = font.render(f"Player {self.reversi.turn}", True, white, blue)
-            textRect = text.get_rect()
-            textRect.center = (665, 80)
-            self.surface.blit(text, textRect)
+            self.draw_text(f"Player {self.reversi.turn}", blue, (665, 80))
 
         else:
             pygame.display.set_caption('Show Text')
-            font = pygame.font.Font('freesansbold.ttf', 20)
             
             if len(self.reversi.outcome) == 1:
-                text = font.render(f"Winner is", True, white, green)
-                textRect = text.get_rect()
-                textRect.center = (700, 160)
-                self.surface.blit(text, textRect)
-                text = font.render(f"Player {self.reversi.outcome[0]}", True, white, green)
-                textRect = text.get_rect()
-                textRect.center = (700, 200)
-                self.surface.blit(text, textRect)
+                self.draw_text("Winner is", green, (700, 160))
+                self.draw_text(f"Player {self.reversi.outcome[0]}", green,
+                               (700, 200))
             else:
-                text = font.render(f"Draw", True, white, green)
-                textRect = text.get_rect()
-                textRect.center = (665, 150)
-                self.surface.blit(text, textRect)
-
-        for move in self.reversi.available_moves:
-            rect = (self.border + move[1] * square,
-                    self.border + move[0] * square,
-                    square, square)
-            fill = (211, 211, 211)
-            pygame.draw.circle(self.surface, color=fill,
-                        center=(self.border + move[1] * square + square / 2, self.border + move[0] * square + square /2), radius=square / 2.5,
-                        width=10)
+                self.draw_text("Draw", green, (665, 150))
+
+        self.surface.blits([(self.move_sprite, self.cell_corners[r][c])
+                            for r, c in self.reversi.available_moves])
+
+    def draw_text(self, message: str, background: Tuple[int, int, int],
+                  center: Tuple[int, int]) -> None:
+        """
+        Draws a line of white text onto the window. Rendered text is cached,
+        since the same few messages are drawn over and over
+
+        Parameters:
+            message : str : text to draw
+            background : Tuple[int, int, int] : color behind the text
+            center : Tuple[int, int] : where to center the text
+
+        Returns: nothing
+        """
+        key = (message, background)
+        if key not in self.text_cache:
+            self.text_cache[key] = self.font.render(message, True, white,
+                                                    background)
+        text = self.text_cache[key]
+        self.surface.blit(text, text.get_rect(center=center))
 
     def react_to(self):
         """
@@ -146,16 +197,16 @@ class ReversiGUI:
 
         Returns: nothing
         """
-        cells_side = len(self.reversi.grid)
-        square = (self.window - 2 * self.border) // cells_side
+        square = self.square
         x, y = pygame.mouse.get_pos()
 
-        if x >= self.border and x <= self.window - self.border and y >= self.border and y <= self.window - self.border:
+        if self.board_rect.collidepoint(x, y):
             row = (y - self.border) // square
             col = (x - self.border) // square
         
             if self.reversi.legal_move((row, col)):
                 self.reversi.apply_move((row, col))
+                self.dirty = True
                 
     def event_loop(self) -> None:
         """
@@ -166,17 +217,22 @@ class ReversiGUI:
         Returns: nothing
         """
         while True:
-            events = pygame.event.get()
-            for event in events:
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
-                elif event.type == pygame.MOUSEBUTTONUP:
-                    self.react_to()
-
-            self.draw_window()
-            pygame.display.update()
-            self.clock.tick(24)
+            # The board only changes when a move is made, so the window is
+            # only redrawn then, or when it has been uncovered or restored
+            if self.dirty:
+                self.draw_window()
+                pygame.display.update()
+                self.dirty = False
+
+            # Sleep until something happens instead of polling every frame
+            event = pygame.event.wait()
+            if event.type == pygame.QUIT:
+                pygame.quit()
+                sys.exit()
+            elif event.type == pygame.MOUSEBUTTONUP:
+                self.react_to()
+            elif event.type in (pygame.WINDOWEXPOSED, pygame.VIDEOEXPOSE):
+                self.dirty = True
 
 
 if __name__ == "__main__":
@@ -4,38 +4,81 @@ Mock implementations of ReversiBase.
 We provide a ReversiStub implementation, and you must
 implement a ReversiMock implementation.
 """
-from typing import List, Tuple, Optional
-from copy import deepcopy
+from typing import Dict, List, Tuple, Optional
+from copy import copy, deepcopy
 
-from reversi import ReversiBase, BoardGridType, ListMovesType
+from reversi import (ReversiBase, BoardGridType, ListMovesType, MAX_PLAYERS,
+                     bits_to_positions, direction_shifts, shift_bits)
+
+_neighbor_masks: Dict[int, List[int]] = {}
+
+
+def neighbor_masks(side: int) -> List[int]:
+    """
+    Returns, for each square of a board with the given side length, a
+    bitboard of the squares next to it, building the table the first time
+    it is needed
+
+    Parameters:
+        side[int]: side length of the board
+
+    Returns[List[int]]: table[r * side + c] is the neighbors of (r, c)
+    """
+    if side not in _neighbor_masks:
+        shifts = direction_shifts(side).values()
+        table = []
+        for idx in range(side * side):
+            neighbors = 0
+            for shift, mask in shifts:
+                neighbors |= shift_bits(1 << idx, shift, mask)
+            table.append(neighbors)
+        _neighbor_masks[side] = table
+    return _neighbor_masks[side]
 
-DIRECTION_LIST = ((1, 1), (0, 1), (1, 0), (-1, -1), (0, -1), (-1, 0), (1, -1),
-                  (-1, 1))
 
 class Board:
     """
     Class to contain a board.
-    The board is a grid where each square in the grid is mapped to "None" if no
-    move has been made there or a piece otherwise.
+    The board is stored as one bitboard per player: an integer where bit
+    r * side + c is set if that player has a piece at (r, c). The grid of
+    "None"s and players is only built when it is asked for.
     """
 
-    _grid: BoardGridType
-    _filled_list: ListMovesType
+    __slots__ = ("_side", "_bitboards", "_full", "_shifts", "_neighbors")
 
-    def __init__(self, side: int):
-        self._grid = [[None]*side for _ in range(side)]
-        self._filled_list = []
+    _side: int
+    _bitboards: List[int]
+    _full: int
+    _shifts: Dict[Tuple[int, int], Tuple[int, int]]
+    _neighbors: List[int]
 
+    def __init__(self, side: int, players: int = MAX_PLAYERS):
+        self._side = side
+        self._full = (1 << side * side) - 1
+        # Index 0 stands for empty squares and is never set, so that
+        # bitboards can be indexed by player number
+        self._bitboards = [0] * (players + 1)
+        self._shifts = direction_shifts(side)
+        self._neighbors = neighbor_masks(side)
+
+    def __deepcopy__(self, memo: Dict[int, object]) -> "Board":
+        """
+        Copies the board. The bitboards are the only state that changes, so
+        the copy gets its own list of them and shares everything else
+        """
+        board = copy(self)
+        board._bitboards = self._bitboards.copy()
+        return board
 
     @property
-    def grid(self) -> BoardGridType:
+    def grid(self) -> List[List[Optional[int]]]:
         """
         Returns a copy of the board's grid
         
         Parameters: none beyond self
-        Returns[BoardGridType]: a grid
+        Returns[List[List[Optional[int]]]]: a grid
         """
-        return self._grid
+        return self._grid_from_bits()
     
     @property
     def size(self) -> int:
@@ -45,18 +88,93 @@ class Board:
         Parameters: none beyond self
         Returns[int]: grid size
         """
-        return len(self._grid)
+        return self._side
+
+    @property
+    def occupied(self) -> int:
+        """
+        Returns a bitboard of every square that has a piece on it
+        
+        Parameters: none beyond self
+        Returns[int]: a bitboard
+        """
+        occupied = 0
+        for bits in self._bitboards:
+            occupied |= bits
+        return occupied
+
+    @property
+    def full(self) -> bool:
+        """
+        Returns whether every square on the board has a piece on it
+        
+        Parameters: none beyond self
+        Returns[bool]: True if the board is full
+        """
+        return self.occupied == self._full
     
     @property
-    def pieces(self) -> int:
+    def pieces(self) -> ListMovesType:
         """
         Returns the list of coordinates at which there are pieces
         
         Parameters: none beyond self
-        Returns: nothing
+        Returns[ListMovesType]: coordinates of the pieces
         """
-        return self._filled_list
-    
+        return bits_to_positions(self.occupied, self._side)
+
+    def neighbors(self, bits: int) -> int:
+        """
+        Finds every square next to (in any of the eight directions) a square
+        of a bitboard, by shifting the whole bitboard once per direction
+        
+        Parameters:
+            bits[int]: a bitboard
+        Returns[int]: a bitboard of the neighboring squares
+        """
+        neighbors = 0
+        for shift, mask in self._shifts.values():
+            neighbors |= shift_bits(bits, shift, mask)
+        return neighbors
+
+    def _grid_from_bits(self) -> List[List[Optional[int]]]:
+        """
+        Builds the grid of "None"s and players from the bitboards
+        
+        Parameters: none beyond self
+        Returns[List[List[Optional[int]]]]: a grid
+        """
+        grid: List[List[Optional[int]]] = [[None] * self._side
+                                           for _ in range(self._side)]
+        for player, bits in enumerate(self._bitboards):
+            for r, c in bits_to_positions(bits, self._side):
+                grid[r][c] = player
+        return grid
+
+    def count(self, player: int) -> int:
+        """
+        Counts a player's pieces
+        
+        Parameters:
+            player[int]: a player in the game
+        Returns[int]: number of pieces the player has on the board
+        """
+        return self._bitboards[player].bit_count()
+
+    def player_at(self, pos: Tuple[int, int]) -> int:
+        """
+        Finds which player has a piece at a specified point in the board
+        
+        Parameters:
+            pos[Tuple[int]]: coordinates within the grid
+        Returns[int]: the player, or 0 if there is no piece there
+        """
+        r, c = pos
+        bit = 1 << r * self._side + c
+        for player, bits in enumerate(self._bitboards):
+            if bits & bit:
+                return player
+        return 0
     
     def add_piece(self, player: int, pos: Tuple[int, int]) -> None:
         """
@@ -67,50 +185,56 @@ class Board:
         Returns: nothing
         """
         r, c = pos
-        self._grid[r][c] = player
-        self._filled_list.append((r, c))
-        for direction in DIRECTION_LIST:
-            y, x = direction
-            if (0 <= r + y < self.size 
-                and 0 <= c + x < self.size) and self._grid[r + y][c + x]:
-                self._grid[r + y][c + x] = player
-                
+        idx = r * self._side + c
+        # The new piece takes over its square and every piece next to it
+        taken = 1 << idx | self._neighbors[idx] & self.occupied
+        for other in range(len(self._bitboards)):
+            self._bitboards[other] &= ~taken
+        self._bitboards[player] |= taken
 
     def update_piece(self, pos: Tuple[int, int], player: int):
         """
         Changes the piece at a given point in the grid to a different player
         """
         r, c = pos
-        if self._grid[r][c]:
-            self._grid[r][c] = player
+        old = self.player_at(pos)
+        if old:
+            self._bitboards[old] ^= 1 << r * self._side + c
+            self._bitboards[player] |= 1 << r * self._side + c
         else:
             print("No piece at that position")
 
-    def get_piece(self, pos: Tuple[int, int]) -> Optional["Piece"]:
+    def get_piece(self, pos: Tuple[int, int]) -> Optional[int]:
         """
         Finds the piece at a specified point in the board
         Parameters:
             pos[Tuple[int]]: coordinates within the grid
-        Returns: a piece if there is one at the coordinates, None if not
+        Returns: the player with a piece at the coordinates, None if there
+        is no piece there
         """
-        r, c = pos
-        return self._grid[r][c]
+        return self.player_at(pos) or None
     
     def update_grid(self, grid: BoardGridType) -> None:
         """
-        Gets rid of the old version of the grid and loads a new one
+        Gets rid of the old version of the grid and loads a new one, checking
+        each square as it goes
         Parameters:
             grid[BoardGridType]: a valid grid with the same side length as the board
+        Raises:
+            ValueError: if a square holds anything but None or a player
         Returns: nothing
         """
-        if len(grid) != len(self._grid):
+        if len(grid) != self._side:
             raise ValueError("Cannot change board size")
-        self._grid = grid
-        self._filled_list = []
-        for r, row in enumerate(self._grid):
+        players = len(self._bitboards) - 1
+        allowed = {None} | set(range(1, players + 1))
+        self._bitboards = [0] * (players + 1)
+        for r, row in enumerate(grid):
             for c, square in enumerate(row):
-                if square:
-                    self._filled_list.append((r, c))
+                if square not in allowed:
+                    raise ValueError("Grid contains invalid player")
+                if square is not None:
+                    self._bitboards[int(square)] |= 1 << r * self._side + c
         
 
 class Piece:
@@ -118,14 +242,14 @@ class Piece:
     Class to contain a piece
     """
 
+    __slots__ = ("_player", "_pos")
+
     _player: int
     _pos: Tuple[int, int]
-    adjacent: dict[Tuple[int, int], "Piece"]
 
     def __init__(self, player: int, pos: Tuple[int, int]):
         self._player = player
         self._pos = pos
-        self.adjacent = {}
 
     @property
     def player(self) -> int:
@@ -197,7 +321,8 @@ class ReversiStub(ReversiBase):
 
     @property
     def grid(self) -> BoardGridType:
-        return deepcopy(self._grid)
+        # The squares only hold ints and Nones, so copying the rows is enough
+        return [row[:] for row in self._grid]
 
     @property
     def turn(self) -> int:
@@ -265,6 +390,8 @@ class ReversiMock(ReversiBase):
     _turn: int
     _done: bool
     _outcome: List[int]
+    _moves_cache: Optional[int]
+    _game_enders: Dict[int, Optional[List[int]]]
 
     def __init__(self, side: int, players: int, othello: bool):
         super().__init__(side, players, othello)
@@ -274,12 +401,18 @@ class ReversiMock(ReversiBase):
         if side % 2 == 1:
             raise ValueError("Odd side lengths not permitted.")
         
-        self._board = Board(side)
+        self._board = Board(side, players)
         self._turn = 1
         self._done = False
         self._outcome = []
+        self._moves_cache = None
         self.first_two = True
 
+        # Squares that end the game, mapped to its winners (None meaning the
+        # player who moved there)
+        self._game_enders = {0: None,
+                             side * side - 1: list(range(1, players + 1))}
+
         if othello:
             self._board.add_piece(1, (side // 2 - 1, side // 2 - 1))
             self._board.add_piece(1, (side // 2, side // 2))
@@ -289,6 +422,16 @@ class ReversiMock(ReversiBase):
             self._board.update_piece((side // 2, side // 2), 2)
             self.first_two = False
 
+    def __deepcopy__(self, memo: Dict[int, object]) -> "ReversiMock":
+        """
+        Copies the game for simulate_moves. Only the board and the outcome
+        list are copied, since everything else is immutable
+        """
+        game = copy(self)
+        game._board = deepcopy(self._board, memo)
+        game._outcome = list(self._outcome)
+        return game
+
     @property
     def size(self) -> int:
         """
@@ -335,24 +478,42 @@ class ReversiMock(ReversiBase):
         If the game is over, this property will not return
         any meaningful value.
         """
+        return bits_to_positions(self._cached_move_bits(), self.size)
+
+    def _cached_move_bits(self) -> int:
+        """
+        Returns the bitboard of available moves, only working it out again
+        after the game has changed
+
+        Returns: a bitboard of the available moves
+        """
+        if self._moves_cache is None:
+            self._moves_cache = self._move_bits()
+        return self._moves_cache
+
+    def _move_bits(self) -> int:
+        """
+        Finds the positions where the current player could place a piece:
+        the northwest and southeast corners and every empty square next to
+        a piece
+
+        Returns: a bitboard of the available moves, which is empty if the
+        game is over
+        """
         if self.done:
-            return []
-        move_list = [(0, 0), (self.size - 1, self.size - 1)]
-        for piece in self._board.pieces:
-            r, c = piece
-            for x in range(-1, 2):
-                for y in range(-1, 2):
-                    if not (self.grid[r + x][c + y] or 
-                            (r + x, c + y) in move_list):
-                        move_list.append((r + x, c + y))
-        return move_list
+            return 0
+        board = self._board
+        occupied = board.occupied
+        corners = 1 | 1 << self._side * self._side - 1
+        return corners | board.neighbors(occupied) & ~occupied
     
     @property
-    def piece_list(self) -> List["Piece"]:
+    def piece_list(self) -> ListMovesType:
         """
-        Returns the set of pieces associated with the board
+        Returns the positions of the pieces on the board, read off the
+        bitboards without creating a Piece for each of them
         Parameters: none other than self
-        Returns: set of pieces
+        Returns: coordinates of the pieces
         """
         return self._board.pieces
 
@@ -408,7 +569,10 @@ class ReversiMock(ReversiBase):
         method) could place a piece in the specified position,
         return True. Otherwise, return False.
         """
-        return pos in self.available_moves
+        r, c = pos
+        if not (0 <= r < self.size and 0 <= c < self.size):
+            return False
+        return bool(self._cached_move_bits() >> r * self.size + c & 1)
     
     def apply_move(self, pos: Tuple[int, int]) -> None:
         """
@@ -443,14 +607,13 @@ class ReversiMock(ReversiBase):
         Returns: None
         """
         self._board.add_piece(self.turn, pos)
-        if pos == (0, 0):
-            self.end_game([self.turn])
-        if pos == (self.size - 1, self.size - 1):
-            self.end_game([i for i in range(1, self.num_players + 1)])
-        if self._turn < self.num_players:
-            self._turn += 1
-        else:
-            self._turn = 1
+        r, c = pos
+        idx = r * self.size + c
+        if idx in self._game_enders:
+            winners = self._game_enders[idx]
+            self.end_game(list(winners) if winners else [self.turn])
+        self._turn = self._turn % self.num_players + 1
+        self._moves_cache = None
 
     def end_game(self, player_list: List[int]) -> None:
         """
@@ -464,6 +627,7 @@ class ReversiMock(ReversiBase):
         self._done = True
         self._outcome = player_list
         self._turn = 1
+        self._moves_cache = None
 
     def load_game(self, turn: int, grid: BoardGridType) -> None:
         """
@@ -494,16 +658,13 @@ class ReversiMock(ReversiBase):
         new_side = len(grid)
         if new_side != self.size:
             raise ValueError("Input is not the same size as the current board")
-        new_board = Board(new_side)
+        # update_grid checks every square as it loads it
+        new_board = Board(new_side, self.num_players)
         new_board.update_grid(grid)
-        for row in grid:
-            for square in row:
-                if square is not None and (square < 1 or 
-                                           square > self.num_players):
-                    raise ValueError("Grid contains invalid player")
         self._board = new_board
         self._done = False
         self._outcome = []
+        self._moves_cache = None
         
 
     def simulate_moves(self, moves: ListMovesType) -> "ReversiBase":
@@ -543,7 +704,7 @@ class ReversiMock(ReversiBase):
         the method was called on, reflecting the state
         of the game after applying the provided moves.
         """
-        if type(moves) == Tuple[int, int]:
+        if isinstance(moves, tuple) and moves and isinstance(moves[0], int):
             raise ValueError("Submitted a single tuple instead of a list")
         
         new_game = deepcopy(self)
@@ -562,45 +723,31 @@ class ReversiBotMock(ReversiMock):
         """
         Returns True if the game is over, False otherwise.
         """
-        done = True
-        for row in self.grid:
-            for piece in row:
-                if piece is None:
-                    done = False
-        return done
+        return self._board.full
     
-    @property
-    def available_moves(self) -> ListMovesType:
+    def _move_bits(self) -> int:
         """
-        Returns the list of positions where the current player
-        (as returned by the turn method) could place a piece.
+        Finds the positions where the current player could place a piece:
+        the empty center squares while the center is being filled, and
+        every empty square next to a piece after that
 
-        If the game is over, this property will not return
-        any meaningful value.
+        Returns: a bitboard of the available moves, which is empty if the
+        game is over
         """
         if self.done:
-            return []
-        move_list = []
+            return 0
+        board = self._board
+        occupied = board.occupied
         if self.first_two:
-            center_filled = True
-            for r in range(self.size // 2 - 1, self.size // 2 + 1):
-                for c in range(self.size // 2 - 1, self.size // 2 + 1):
-                    if not self.grid[r][c]:
-                        move_list.append((r, c))
-                        center_filled = False
-            if center_filled:
-                self.first_two = False
-        if not self.first_two:
-            for piece in self._board.pieces:
-                r, c = piece
-                for dir in DIRECTION_LIST:
-                    y, x = dir
-                    if ((0 <= r + y < self.size 
-                        and 0 <= c + x < self.size) 
-                        and not (self.grid[r + y][c + x] or ((r + y, c + x) in 
-                                move_list))):
-                        move_list.append((r + y, c + x))
-        return move_list
+            side = self._side
+            half = side // 2
+            # The four center squares: two pairs of neighbors in a row
+            center = 3 << (half - 1) * side + half - 1
+            center |= center << side
+            if center & ~occupied:
+                return center & ~occupied
+            self.first_two = False
+        return board.neighbors(occupied) & ~occupied
     
     def apply_move(self, pos: Tuple[int, int]) -> None:
         """
@@ -634,31 +781,18 @@ class ReversiBotMock(ReversiMock):
 
         Returns: None
         """
+        # add_piece already gives the player every piece next to the move
         self._board.add_piece(self.turn, pos)
-        for dir in DIRECTION_LIST:
-            r, c = pos
-            y, x = dir
-            if (0 <= r + y < self.size 
-                and 0 <= c + x < self.size) and self._board.grid[r + y][c + x]:
-                self._board.update_piece((r + y, c + x), self.turn)
         if self.done:
-            n = 0
-            for row in self.grid:
-                for piece in row:
-                    if piece == 1:
-                        n += 1
-                    if piece == 2:
-                        n -= 1
+            n = self._board.count(1) - self._board.count(2)
             if n > 0:
                 self.end_game([1])
             if n < 0:
                 self.end_game([2])
             if n == 0:
                 self.end_game([1, 2])
-        if self._turn < self.num_players:
-            self._turn += 1
-        else:
-            self._turn = 1
+        self._turn = self._turn % self.num_players + 1
+        self._moves_cache = None
 
     def simulate_moves(self, moves: ListMovesType) -> "ReversiBase":
         """
@@ -697,7 +831,7 @@ class ReversiBotMock(ReversiMock):
         the method was called on, reflecting the state
         of the game after applying the provided moves.
         """
-        if type(moves) == Tuple[int, int]:
+        if isinstance(moves, tuple) and moves and isinstance(moves[0], int):
             raise ValueError("Submitted a single tuple instead of a list")
         
         new_game = deepcopy(self)
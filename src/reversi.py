@@ -5,8 +5,10 @@ Contains a base class (ReversiBase). You must implement
 a Reversi class that inherits from this base class.
 """
 from abc import ABC, abstractmethod
-from typing import List, Tuple, Optional
-from copy import deepcopy
+from collections import OrderedDict
+from typing import Dict, List, Tuple, Optional
+from copy import copy, deepcopy
+import random
 import numpy as np
 
 BoardGridType = np.ndarray
@@ -26,40 +28,247 @@ Type for representing lists of moves on the board.
 DIRECTION_LIST = ((1, 1), (0, 1), (1, 0), (-1, -1), (0, -1), (-1, 0), (1, -1),
                   (-1, 1))
 
+MAX_PLAYERS = 9
+
+MOVES_CACHE_SIZE = 100_000
+"""
+Maximum number of positions whose available moves are remembered
+"""
+
+_ZOBRIST_RNG = random.Random(142)
+
+ZOBRIST_TURN_KEYS = [_ZOBRIST_RNG.getrandbits(64)
+                     for _ in range(MAX_PLAYERS + 1)]
+"""
+Random 64-bit keys XORed into a position's hash to encode whose turn it is
+"""
+
+_zobrist_piece_keys: Dict[int, List[List[int]]] = {}
+
+
+def zobrist_keys(side: int) -> List[List[int]]:
+    """
+    Returns the table of Zobrist keys for a board with the given side length,
+    building it the first time it is needed. The key for a piece of a player
+    on square (r, c) is table[r * side + c][player].
+
+    Parameters:
+        side[int]: side length of the board
+
+    Returns[List[List[int]]]: a table of random 64-bit keys
+    """
+    if side not in _zobrist_piece_keys:
+        _zobrist_piece_keys[side] = [
+            [_ZOBRIST_RNG.getrandbits(64) for _ in range(MAX_PLAYERS + 1)]
+            for _ in range(side * side)]
+    return _zobrist_piece_keys[side]
+
+
+_direction_shifts: Dict[int, Dict[Tuple[int, int], Tuple[int, int]]] = {}
+
+
+def direction_shifts(side: int) -> Dict[Tuple[int, int], Tuple[int, int]]:
+    """
+    Returns, for each direction in DIRECTION_LIST, the shift and mask that
+    move every square of a bitboard one step in that direction. Square (r, c)
+    is bit r * side + c, so a step of (y, x) is a shift by y * side + x, and
+    the mask clears the bits that would otherwise wrap around to the other
+    edge of the board.
+
+    Parameters:
+        side[int]: side length of the board
+
+    Returns[Dict[Tuple[int, int], Tuple[int, int]]]: maps a direction to a
+    (shift, mask) pair
+    """
+    if side not in _direction_shifts:
+        full = (1 << side * side) - 1
+        first_col = sum(1 << r * side for r in range(side))
+        last_col = first_col << side - 1
+
+        shifts = {}
+        for y, x in DIRECTION_LIST:
+            mask = full
+            if x == 1:
+                mask &= ~first_col
+            elif x == -1:
+                mask &= ~last_col
+            shifts[(y, x)] = (y * side + x, mask)
+        _direction_shifts[side] = shifts
+    return _direction_shifts[side]
+
+
+_direction_rays: Dict[int, List[List[Tuple[int, bool]]]] = {}
+
+
+def direction_rays(side: int) -> List[List[Tuple[int, bool]]]:
+    """
+    Returns, for each square, the rays leading from it to the edge of the
+    board in each direction in DIRECTION_LIST, building the table the first
+    time it is needed. A ray is a bitboard of every square passed on the
+    way, not counting the starting square; rays of length 0 are left out.
+
+    Parameters:
+        side[int]: side length of the board
+
+    Returns[List[List[Tuple[int, bool]]]]: table[r * side + c] lists a
+    (ray, forward) pair per direction, where forward is True if the ray
+    runs towards higher bits
+    """
+    if side not in _direction_rays:
+        table = []
+        for r in range(side):
+            for c in range(side):
+                rays = []
+                for y, x in DIRECTION_LIST:
+                    ray = 0
+                    new_r, new_c = r + y, c + x
+                    while 0 <= new_r < side and 0 <= new_c < side:
+                        ray |= 1 << new_r * side + new_c
+                        new_r += y
+                        new_c += x
+                    if ray:
+                        rays.append((ray, y * side + x > 0))
+                table.append(rays)
+        _direction_rays[side] = table
+    return _direction_rays[side]
+
+
+def shift_bits(bits: int, shift: int, mask: int) -> int:
+    """
+    Moves every square of a bitboard one step in a direction
+
+    Parameters:
+        bits[int]: a bitboard
+        shift[int], mask[int]: a pair returned by direction_shifts
+
+    Returns[int]: the shifted bitboard
+    """
+    if shift > 0:
+        return (bits << shift) & mask
+    return (bits >> -shift) & mask
+
+
+def fill_moves(own: int, opp: int, empty: int, shift: int, mask: int) -> int:
+    """
+    Finds the empty squares from which a line in one direction flips pieces,
+    by sliding a player's pieces backwards over runs of other players' pieces
+
+    Parameters:
+        own[int]: bitboard of the player's pieces
+        opp[int]: bitboard of every other player's pieces
+        empty[int]: bitboard of the empty squares
+        shift[int], mask[int]: the direction_shifts pair for the opposite
+        of the direction the line runs in
+
+    Returns[int]: a bitboard of the moves
+    """
+    run = shift_bits(own, shift, mask) & opp
+    while True:
+        grown = run | (shift_bits(run, shift, mask) & opp)
+        if grown == run:
+            break
+        run = grown
+    return shift_bits(run, shift, mask) & empty
+
+
+def bits_to_positions(bits: int, side: int) -> ListMovesType:
+    """
+    Lists the squares that are set in a bitboard
+
+    Parameters:
+        bits[int]: a bitboard
+        side[int]: side length of the board
+
+    Returns[ListMovesType]: coordinates of the set squares, in index order
+    """
+    positions = []
+    while bits:
+        low = bits & -bits
+        positions.append(divmod(low.bit_length() - 1, side))
+        bits ^= low
+    return positions
+
+
 class Board:
     """
     Class to contain a board.
-    The board is a grid where each square in the grid is mapped to "None" if no
-    move has been made there or a piece otherwise.
+    The board is stored as one bitboard per player: an integer where bit
+    r * side + c is set if that player has a piece at (r, c). Python integers
+    grow as needed, so the same code handles boards of any size.
     """
 
-    _grid: BoardGridType
-    _pieces: List[List[Optional["Piece"]]]
+    __slots__ = ("_side", "_full", "_bitboards", "_occupied", "_shifts",
+                 "_rays", "_keys", "_hash", "_grid_cache")
+
+    _side: int
+    _full: int
+    _bitboards: List[int]
+    _occupied: int
+    _shifts: Dict[Tuple[int, int], Tuple[int, int]]
+    _rays: List[List[Tuple[int, bool]]]
+    _keys: List[List[int]]
+    _hash: int
+    _grid_cache: Optional[BoardGridType]
 
     def __init__(self, side: int):
-        self._grid = np.zeros((side, side), dtype=np.int_)
-        self._pieces = [[None]*side for _ in range(side)]
+        self._side = side
+        self._full = (1 << side * side) - 1
+        self._bitboards = [0] * (MAX_PLAYERS + 1)
+        self._occupied = 0
+        self._shifts = direction_shifts(side)
+        self._rays = direction_rays(side)
+        self._keys = zobrist_keys(side)
+        self._hash = 0
+        self._grid_cache = None
 
+    def __deepcopy__(self, memo: Dict[int, object]) -> "Board":
+        """
+        Copies the board. The bitboards and the hash are the only state that
+        changes, so the copy gets its own list of bitboards and shares the
+        lookup tables
+        """
+        board = copy(self)
+        board._bitboards = self._bitboards.copy()
+        return board
 
-    @property
-    def grid(self) -> BoardGridType:
+    def clear(self) -> None:
         """
-        Returns a copy of the board's grid
+        Removes every piece from the board
         
         Parameters: none beyond self
-        Returns[BoardGridType]: a grid
+        Returns: nothing
         """
-        return self._grid
-    
+        for player in range(MAX_PLAYERS + 1):
+            self._bitboards[player] = 0
+        self._occupied = 0
+        self._hash = 0
+        self._grid_cache = None
+
     @property
-    def piece_grid(self) -> List[List[Optional["Piece"]]]:
+    def grid(self) -> BoardGridType:
         """
-        Returns a copy of the board's piece grid
+        Returns the board's grid as a read-only array. The grid is built from
+        the bitboards the first time it is asked for after the board
+        changes, and the same array is handed out until the next change.
+        A new array is built after every change rather than updating the old
+        one, so a grid that was returned earlier keeps showing the position
+        it was taken from
         
         Parameters: none beyond self
-        Returns[List[List[Optional[Piece]]]]: a grid of pieces
+        Returns[BoardGridType]: a grid
         """
-        return self._pieces
+        if self._grid_cache is None:
+            n = self._side * self._side
+            grid = np.zeros(n, dtype=np.int8)
+            for player, bits in enumerate(self._bitboards):
+                if bits:
+                    raw = np.frombuffer(bits.to_bytes((n + 7) // 8, "little"),
+                                        dtype=np.uint8)
+                    grid[np.unpackbits(raw, bitorder="little")[:n] == 1] = player
+            self._grid_cache = grid.reshape(self._side, self._side)
+            self._grid_cache.flags.writeable = False
+        return self._grid_cache
     
     @property
     def size(self) -> int:
@@ -69,21 +278,87 @@ class Board:
         Parameters: none beyond self
         Returns[int]: grid size
         """
-        return len(self._grid)
-    
+        return self._side
+
+    @property
+    def occupied(self) -> int:
+        """
+        Returns a bitboard of every square that has a piece on it, which is
+        kept up to date as pieces are added and removed
+        
+        Parameters: none beyond self
+        Returns[int]: a bitboard
+        """
+        return self._occupied
+
+    @property
+    def full(self) -> bool:
+        """
+        Returns whether every square on the board has a piece on it
+        
+        Parameters: none beyond self
+        Returns[bool]: True if the board is full
+        """
+        return self.occupied == self._full
+
     @property
-    def pieces(self) -> List["Piece"]:
+    def zhash(self) -> int:
         """
-        Returns a copy of the board's piece list
+        Returns the Zobrist hash of the pieces on the board, which is kept up
+        to date as pieces are added, removed and flipped
         
         Parameters: none beyond self
-        Returns[List[Piece]]: a list of the pieces in the board
+        Returns[int]: a 64-bit hash
         """
-        final_list = []
-        for row in self._pieces:
-            final_list += row
-        return list(filter(lambda x: x is not None, final_list)) # type: ignore
+        return self._hash
     
+    @property
+    def pieces(self) -> ListMovesType:
+        """
+        Returns the positions of the pieces on the board, built from the
+        bitboards
+        
+        Parameters: none beyond self
+        Returns[ListMovesType]: coordinates of every piece, in index order
+        """
+        return bits_to_positions(self._occupied, self._side)
+
+    def bitboard(self, player: int) -> int:
+        """
+        Returns the bitboard of a player's pieces
+        
+        Parameters:
+            player[int]: a player in the game
+        Returns[int]: a bitboard
+        """
+        return self._bitboards[player]
+
+    def count(self, player: int) -> int:
+        """
+        Counts a player's pieces
+        
+        Parameters:
+            player[int]: a player in the game
+        Returns[int]: number of pieces the player has on the board
+        """
+        return self._bitboards[player].bit_count()
+
+    def player_at(self, pos: Tuple[int, int]) -> int:
+        """
+        Finds which player has a piece at a specified point in the board
+        
+        Parameters:
+            pos[Tuple[int]]: coordinates within the grid
+        Returns[int]: the player, or 0 if there is no piece there
+        """
+        r, c = pos
+        bit = 1 << r * self._side + c
+        if not self._occupied & bit:
+            return 0
+        for player, bits in enumerate(self._bitboards):
+            if bits & bit:
+                return player
+        return 0
     
     def add_piece(self, player: int, pos: Tuple[int, int]) -> None:
         """
@@ -94,10 +369,11 @@ class Board:
         Returns: nothing
         """
         r, c = pos
-        new_piece = Piece(player, pos)
-                
-        self._grid[r][c] = player
-        self._pieces[r][c] = new_piece
+        idx = r * self._side + c
+        self._bitboards[player] |= 1 << idx
+        self._occupied |= 1 << idx
+        self._hash ^= self._keys[idx][player]
+        self._grid_cache = None
 
     def remove_piece(self, pos: Tuple[int, int]) -> None:
         """
@@ -107,86 +383,183 @@ class Board:
         Returns: nothing
         """
         r, c = pos
-        self._grid[r][c] = 0
-        self._pieces[r][c] = None
+        idx = r * self._side + c
+        player = self.player_at(pos)
+        self._bitboards[player] &= ~(1 << idx)
+        self._occupied &= ~(1 << idx)
+        self._hash ^= self._keys[idx][player]
+        self._grid_cache = None
 
     def update_piece(self, pos: Tuple[int, int], player: int) -> None:
         """
         Changes the piece at a given point in the grid to a different player
         """
         r, c = pos
-        if self._grid[r][c]:
-            self._grid[r][c] = player
-            self._pieces[r][c].update_player(player) # type: ignore
+        idx = r * self._side + c
+        old = self.player_at(pos)
+        if old:
+            player = int(player)
+            self._bitboards[old] ^= 1 << idx
+            self._bitboards[player] |= 1 << idx
+            self._hash ^= self._keys[idx][old] ^ self._keys[idx][player]
+            self._grid_cache = None
         else:
             raise ValueError("No piece at that position")
 
-    def get_piece(self, pos: Tuple[int, int]) -> Optional["Piece"]:
+    def play(self, player: int, pos: Tuple[int, int]) -> List[Tuple[int, int]]:
         """
-        Finds the piece at a specified point in the board
+        Places a player's piece and flips every piece it brackets, in all
+        eight directions at once
+        
         Parameters:
+            player[int]: the player making the move
             pos[Tuple[int]]: coordinates within the grid
-        Returns: piece at the coordinates
+        Returns[List[Tuple[int, int]]]: for each player who lost pieces, the
+        player and a bitboard of the pieces they lost
         """
-        r, c = pos
-        return self._pieces[r][c]
-    
-    def update_grid(self, grid: BoardGridType) -> None:
+        flipped = self.flips(player, pos)
+        self.add_piece(player, pos)
+
+        taken = []
+        if flipped:
+            for other, bits in enumerate(self._bitboards):
+                if other != player and bits & flipped:
+                    taken.append((other, bits & flipped))
+                    self._transfer(bits & flipped, other, player)
+        return taken
+
+    def unplay(self, player: int, pos: Tuple[int, int],
+               taken: List[Tuple[int, int]]) -> None:
         """
-        Gets rid of the old version of the grid and loads a new one
+        Undoes a call to play
+        
         Parameters:
-            grid[BoardGridType]: a valid grid with the same side length as the board
+            player[int]: the player who made the move
+            pos[Tuple[int]]: coordinates of the move
+            taken[List[Tuple[int, int]]]: what play returned
         Returns: nothing
         """
-        if len(grid) != len(self._grid):
-            raise ValueError("Cannot change board size")
+        for other, bits in taken:
+            self._transfer(bits, player, other)
+        self.remove_piece(pos)
+
+    def _transfer(self, bits: int, old: int, new: int) -> None:
+        """
+        Changes a set of one player's pieces into another player's
         
-        self._pieces = [[None]*self.size for _ in range(self.size)]
-        for r, row in enumerate(grid):
-            for c, square in enumerate(row):
-                if square:
-                    self._pieces[r][c] = Piece(square, (r, c))
-        self._grid = grid
+        Parameters:
+            bits[int]: a bitboard of pieces that all belong to old
+            old[int], new[int]: players in the game
+        Returns: nothing
+        """
+        self._bitboards[old] ^= bits
+        self._bitboards[new] |= bits
+        self._grid_cache = None
+        while bits:
+            low = bits & -bits
+            keys = self._keys[low.bit_length() - 1]
+            self._hash ^= keys[old] ^ keys[new]
+            bits ^= low
+
+    def move_masks(self, player: int) -> Dict[Tuple[int, int], int]:
+        """
+        Finds the squares where a player could move, using shifts of the
+        bitboards. For each direction, the squares reached by sliding the
+        player's pieces backwards over a run of other players' pieces are
+        the empty squares from which a line in that direction flips pieces.
         
+        Parameters:
+            player[int]: a player in the game
+        Returns[Dict[Tuple[int, int], int]]: maps each direction to a
+        bitboard of the moves that flip pieces in that direction
+        """
+        own = self._bitboards[player]
+        opp = self.occupied & ~own
+        empty = self._full & ~(own | opp)
 
-class Piece:
-    """
-    Class to contain a piece
-    """
-
-    _player: int
-    _pos: Tuple[int, int]
-
-    def __init__(self, player: int, pos: Tuple[int, int]):
-        self._player = player
-        self._pos = pos
+        masks = {}
+        for y, x in DIRECTION_LIST:
+            shift, mask = self._shifts[(-y, -x)]
+            masks[(y, x)] = fill_moves(own, opp, empty, shift, mask)
+        return masks
 
-    @property
-    def player(self) -> int:
+    def has_moves(self, player: int) -> bool:
         """
-        Which player played this piece
-        Paramters: None beyond self
-        Returns [int]: player name
+        Checks whether a player has anywhere to move, stopping at the first
+        direction that has a move instead of finding all of them
+        
+        Parameters:
+            player[int]: a player in the game
+        Returns[bool]: True if the player has at least one move
         """
-        return self._player
+        own = self._bitboards[player]
+        opp = self._occupied & ~own
+        empty = self._full & ~self._occupied
+
+        for y, x in DIRECTION_LIST:
+            shift, mask = self._shifts[(-y, -x)]
+            if fill_moves(own, opp, empty, shift, mask):
+                return True
+        return False
     
-    @property
-    def pos(self) -> Tuple[int, int]:
+    def flips(self, player: int, pos: Tuple[int, int]) -> int:
         """
-        Where on its board the piece is located
+        Finds the pieces that a player would flip by moving at a position,
+        without changing the board
+        
+        Parameters:
+            player[int]: a player in the game
+            pos[Tuple[int]]: coordinates within the grid
+        Returns[int]: a bitboard of the pieces that would be flipped
         """
-        return self._pos
+        r, c = pos
+        own = self._bitboards[player]
+        opp = self._occupied & ~own
+
+        # Along each ray, the pieces flipped are the run of other players'
+        # pieces before the nearest square that isn't one, provided that
+        # square holds one of the player's own pieces
+        flipped = 0
+        for ray, forward in self._rays[r * self._side + c]:
+            stops = ray & ~opp
+            if not stops:
+                continue
+            if forward:
+                nearest = stops & -stops
+                run = ray & (nearest - 1)
+            else:
+                nearest = 1 << stops.bit_length() - 1
+                run = ray & ~((nearest << 1) - 1)
+            if nearest & own:
+                flipped |= run
+        return flipped
     
-    def update_player(self, player: int) -> None:
+    def update_grid(self, grid: BoardGridType,
+                    players: int = MAX_PLAYERS) -> None:
         """
-        Changes the player attribute to a new value
-        
+        Gets rid of the old version of the grid and loads a new one, checking
+        each square as it goes
         Parameters:
-            player[int]: a player in the game
-            
+            grid[BoardGridType]: a valid grid with the same side length as the board
+            players[int]: number of players in the game
+        Raises:
+            ValueError: if a square holds anything but 0 or a player
         Returns: nothing
         """
-        self._player = player
+        if len(grid) != self._side:
+            raise ValueError("Cannot change board size")
+        
+        self._bitboards = [0] * (MAX_PLAYERS + 1)
+        self._occupied = 0
+        self._hash = 0
+        self._grid_cache = None
+        for r, row in enumerate(grid):
+            for c, square in enumerate(row):
+                if square:
+                    if not 0 < square <= players:
+                        raise ValueError("Grid contains invalid player")
+                    self.add_piece(int(square), (r, c))
+        
 
 class ReversiBase(ABC):
     """
@@ -442,7 +815,13 @@ class Reversi(ReversiBase):
     _done: bool
     first_two: bool
     _outcome: List[int]
-    _moves: List[Tuple[int, List[Tuple[Tuple[int, int], int]]]]
+    _moves: List[Tuple[int, bool, Tuple[int, int], List[Tuple[int, int]]]]
+    _opening: int
+    _last_moves: Tuple[int, ListMovesType]
+
+    # Available moves only depend on the pieces and whose turn it is, which
+    # is exactly what zhash identifies, so one cache is shared by all games
+    _moves_cache: "OrderedDict[int, ListMovesType]" = OrderedDict()
 
     def __init__(self, side: int, players: int, othello: bool):
         """
@@ -471,33 +850,55 @@ class Reversi(ReversiBase):
             raise ValueError("Parity of players and side length must match.")
         
         self._board = Board(side)
+        self._moves = []
+        self._last_moves = (-1, [])
+
+        # The squares the opening pieces are placed on only depend on the
+        # board size and player count, so they are worked out once here
+        self._opening = 0
+        if not othello:
+            middle = side // 2
+            lower_bound = middle - players // 2
+            upper_bound = middle + players // 2 + side % 2
+            for r in range(lower_bound, upper_bound):
+                for c in range(lower_bound, upper_bound):
+                    self._opening |= 1 << (r * side + c)
+
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Puts the game back in its starting position, reusing the existing
+        board so that many games can be played with a single object
+
+        Returns: nothing
+        """
+        side = self._side
+        self._board.clear()
         self._turn = 1
         self._done = False
         self._outcome = []
+        self._moves.clear()
         self.first_two = True
-        self._moves = []
 
-        if othello:
+        if self._othello:
             self._board.add_piece(2, (side // 2 - 1, side // 2 - 1))
             self._board.add_piece(2, (side // 2, side // 2))
             self._board.add_piece(1, (side // 2, side // 2 - 1))
             self._board.add_piece(1, (side // 2 - 1, side // 2))
             self.first_two = False
 
-    @property
-    def size(self) -> int:
+    def __deepcopy__(self, memo: Dict[int, object]) -> "Reversi":
         """
-        Returns the size of the board (the number of squares per side)
+        Copies the game. Besides the board, only the outcome and the list of
+        moves can change in place, so everything else is shared
         """
-        return self._side
+        game = copy(self)
+        game._board = deepcopy(self._board, memo)
+        game._outcome = list(self._outcome)
+        game._moves = list(self._moves)
+        return game
 
-    @property
-    def num_players(self) -> int:
-        """
-        Returns the number of players
-        """
-        return self._players
-    
     @property
     def grid(self) -> BoardGridType:
         """
@@ -506,16 +907,41 @@ class Reversi(ReversiBase):
         piece at that location for that player) or 0,
         meaning there is no piece in that location. Players are
         numbered from 1.
+
+        The array is read-only; copy it before making changes to it.
         """
         return self._board.grid
     
     @property
-    def pieces(self) -> List["Piece"]:
+    def pieces(self) -> ListMovesType:
         """
-        Returns a list of pieces on the board
+        Returns the positions of the pieces on the board
         """
         return self._board.pieces
 
+    def piece_count(self, player: int) -> int:
+        """
+        Returns the number of pieces a player has on the board
+        """
+        return self._board.count(player)
+
+    def bitboard(self, player: int) -> int:
+        """
+        Returns a bitboard of a player's pieces (bit r * size + c is set if
+        the player has a piece at (r, c))
+        """
+        return self._board.bitboard(player)
+
+    def flips(self, pos: Tuple[int, int]) -> int:
+        """
+        Returns a bitboard of the pieces the current player would flip by
+        moving at pos (bit r * size + c is set for a flipped piece at (r, c)).
+        Nothing is flipped while the opening pieces are being placed.
+        """
+        if self.first_two:
+            return 0
+        return self._board.flips(self._turn, pos)
+
     @property
     def turn(self) -> int:
         """
@@ -528,95 +954,43 @@ class Reversi(ReversiBase):
         """
         return self._turn
 
-    def move_works(self, piece: "Piece", 
-                    dir: Tuple[int, int],
-                    rec: int=1) -> Optional[Tuple[int, int]]:
+    @property
+    def zhash(self) -> int:
         """
-        Returns the coordinate of a move if there is one a certain direction
-        adjacent to a certain piece
-        
-        Parameters:
-            piece[Piece]: a piece on the board
-            dir[Tuple[int, int]]: coordinates indicating a direction
-            rec[int]: number of pieces that the function has checked
-            
-        Returns: coordinates if the move works, None if not
-        """
-
-        r, c = piece.pos
-        y, x = dir
-
-        # The following conditional first checks to make sure the piece is not 
-        # on the edge of the board such that checking the space in or opposite 
-        # the specified direction will produce an error. This code is built 
-        # around checking whether pieces can be flipped, so it then checks to 
-        # make sure the specified piece was placed by a different player than 
-        # the one whose turn it is. Then, it checks to make sure there's a 
-        # piece in the given direction, because if a player doesn't have a 
-        # piece somewhere in the given direction, there's no way they can flip 
-        # pieces. Finally, it makes sure that either a piece could be placed 
-        # opposite the given direction (i.e. the given piece is on the end) 
-        # or the function has already called itself.
-
-        if  ((0 <= r - y < self.size and 0 <= c - x < self.size 
-             and 0 <= r + y < self.size and 0 <= c + x < self.size)
-             and self.grid[r][c] != self.turn and self.grid[r + y][c + x] 
-             and (not self.grid[r - y][c - x] or rec > 1)):
-            
-            if self.grid[r + y][c + x] == self.turn:
-                return (r - rec * y, c - rec * x)
-            else:
-                return self.move_works(self._board.piece_grid[r + y][c + x], # type: ignore
-                                       dir, rec + 1) 
-        else:
-            return None
-        
-    def find_moves(self) -> dict[Tuple[int, int], List[Tuple[int, int]]]:
+        Returns a Zobrist hash of the current position, including whose turn
+        it is. Equal positions reached through different move orders have
+        the same hash.
+        """
+        return self._board.zhash ^ ZOBRIST_TURN_KEYS[self._turn]
+
+    def find_moves(self) -> Dict[Tuple[int, int], int]:
         """
         Finds all valid moves in a board
         
         Parameters: none beyond self
-        Returns[dict]: A dictionary that maps a direction in which the move can 
-        flip pieces to a list of possible moves dependent on that direction 
-        (Note that the direction is not meaningful for the first two moves)
+        Returns[dict]: A dictionary that maps each possible move to a mask of 
+        the directions in which it flips pieces, where bit i stands for 
+        DIRECTION_LIST[i] (the mask is 0 for the first two moves)
         """
 
         if self.done:
             return {}
         
-        move_list = {}
+        move_list: Dict[Tuple[int, int], int] = {}
 
         if self.first_two:
-            center_filled = True
-            middle = self.size // 2
-            lower_bound = middle - self.num_players // 2
-            upper_bound = middle + self.num_players // 2
-            upper_bound += self.size % 2
-
-            for r in range(lower_bound, upper_bound):
-                for c in range(lower_bound, upper_bound):
-                    if not self.grid[r][c]:
-                        move_list[(r, c)] = [(r, c)]
-                        center_filled = False
+            empty = self._opening & ~self._board.occupied
+            for pos in bits_to_positions(empty, self.size):
+                move_list[pos] = 0
                 
-            if center_filled:
+            if not empty:
                 self.first_two = False
 
         if not self.first_two:
-            for piece in self.pieces:
-                if piece.player != self.turn:
-                    for dir in DIRECTION_LIST:
-
-                        r, c = piece.pos
-                        y, x = dir
-
-                        if ((0 <= r - y < self.size and 0 <= c - x < self.size) 
-                            and (not self.grid[r - y][c - x] and 
-                            self.move_works(piece, dir))):
-                            if dir in move_list:
-                                move_list[dir].append((r - y, c - x))
-                            else:
-                                move_list[dir] = [(r - y, c - x)]
+            masks = self._board.move_masks(self.turn)
+            for i, dir in enumerate(DIRECTION_LIST):
+                for pos in bits_to_positions(masks[dir], self.size):
+                    move_list[pos] = move_list.get(pos, 0) | 1 << i
 
         return move_list
     
@@ -628,13 +1002,31 @@ class Reversi(ReversiBase):
 
         If the game is over, this property will not return
         any meaningful value.
-        """
-        move_list = []
 
-        for dir_moves in list(self.find_moves().values()):
-            for move in dir_moves:
-                if move not in move_list:
-                    move_list.append(move)
+        Moves are remembered per position, so the returned list may be
+        shared and must not be modified.
+        """
+        key = self.zhash
+        if not (self.done or self.first_two):
+            # The same position is often asked about several times in a row
+            # (legal_move, check_for_dead_moves, the bots), so the last
+            # answer is kept outside the shared cache as well
+            if self._last_moves[0] == key:
+                return self._last_moves[1]
+            if key in self._moves_cache:
+                self._moves_cache.move_to_end(key)
+                self._last_moves = (key, self._moves_cache[key])
+                return self._last_moves[1]
+
+        move_list = list(self.find_moves())
+
+        # The opening placements depend on more than the position, so they
+        # are not cached (find_moves may also have just ended the opening)
+        if not (self.done or self.first_two):
+            self._last_moves = (key, move_list)
+            self._moves_cache[key] = move_list
+            if len(self._moves_cache) > MOVES_CACHE_SIZE:
+                self._moves_cache.popitem(last=False)
             
         return move_list
 
@@ -680,8 +1072,9 @@ class Reversi(ReversiBase):
         """
         r, c = pos
         if 0 <= r < self.size and 0 <= c < self.size:
-            if self.grid[r][c]:
-                return self.grid[r][c]
+            player = self._board.player_at(pos)
+            if player:
+                return player
             return None
         else:
             raise ValueError("Specified position outside board")
@@ -744,40 +1137,29 @@ class Reversi(ReversiBase):
         if not (0 <= r < self.size and 0 <= c < self.size):
             raise ValueError("Specified position outside board")
         
-        move_dict = self.find_moves()
-        
-        self._board.add_piece(self.turn, pos)
-        mv = [(pos, 0)]
-
-        for dir in DIRECTION_LIST:
-            if dir in move_dict:
-                if pos in move_dict[dir]:
-
-                    y, x = dir
-
-                    new_y = r + y
-                    new_x = c + x
+        # find_moves clears first_two once the center is full, so record it
+        # before calling it
+        first_two = self.first_two
+        if first_two:
+            self.find_moves()
 
-                    while True:
-                        if ((0 <= new_y < self.size 
-                            and 0 <= new_x < self.size)
-                            and self.grid[new_y][new_x] != self.turn):
-
-                            mv.append(((new_y, new_x), 
-                                        self.grid[new_y][new_x]))
-                            self._board.update_piece((new_y, new_x), 
-                                                        self.turn)
-                            new_y += y
-                            new_x += x
-                        else:
-                            break
+        # Nothing gets flipped while the opening pieces are being placed
+        if self.first_two:
+            self._board.add_piece(self.turn, pos)
+            taken = []
+        else:
+            taken = self._board.play(self.turn, pos)
 
-        self._moves.append((self.turn, mv))   
+        self._moves.append((self.turn, first_two, pos, taken))
 
         self.skip_turn()
         
-        if (not self.first_two and len(np.unique(self.grid)) in [1, 2]
-            or len(self.pieces) == self.size ** 2):
+        players_left = 0
+        for player in range(1, self.num_players + 1):
+            if self._board.bitboard(player):
+                players_left += 1
+
+        if not self.first_two and players_left <= 1 or self._board.full:
             self.end_game()
         
     def check_for_dead_moves(self) -> None:
@@ -790,18 +1172,26 @@ class Reversi(ReversiBase):
         Returns: nothing
         """
 
-        n = 0
-        while True:
-            if n == self.num_players:
-                self.end_game()
-                break
+        for _ in range(self.num_players):
+            if self._has_any_move():
+                return
+            self.skip_turn()
 
-            if len(self.available_moves) == 0:
-                n += 1
-            else:
-                break
+        self.end_game()
 
-            self.skip_turn()
+    def _has_any_move(self) -> bool:
+        """
+        Checks whether the current player can move, without building the
+        list of moves when it isn't already cached
+        
+        Parameters: None beyond self
+        Returns[bool]: True if the current player has a move
+        """
+        if self.done or self.first_two:
+            return bool(self.available_moves)
+        if self._last_moves[0] == self.zhash:
+            return bool(self._last_moves[1])
+        return self._board.has_moves(self.turn)
 
     def skip_turn(self) -> None:
         """
@@ -822,21 +1212,11 @@ class Reversi(ReversiBase):
             
         Returns: nothing
         """
-        final_dict = {}
-        highest_pieces = 0
-
-        for i in range(1, self.num_players + 1):
-            final_dict[i] = 0
-
-        for piece in self.pieces:
-            final_dict[piece.player] += 1
-
-        for player in final_dict:
-            if final_dict[player] > highest_pieces:
-                self._outcome = [player]
-                highest_pieces = final_dict[player]
-            elif final_dict[player] == highest_pieces:
-                self._outcome.append(player)
+        counts = [self._board.count(player)
+                  for player in range(1, self.num_players + 1)]
+        highest_pieces = max(counts)
+        self._outcome = [player for player, count in enumerate(counts, 1)
+                         if count == highest_pieces]
 
         self._done = True
         self._turn = 1
@@ -872,14 +1252,8 @@ class Reversi(ReversiBase):
             raise ValueError("Input is not the same size as the current board")
         
         new_board = Board(new_side)
-        new_board.update_grid(grid)
+        new_board.update_grid(grid, self.num_players)
 
-        for row in grid:
-            for square in row:
-                if square is not None:
-                    if square > self.num_players or square < 0:
-                        raise ValueError("Grid contains invalid player")
-                
         self._board = new_board
         self._done = False
         self._outcome = []
@@ -887,31 +1261,21 @@ class Reversi(ReversiBase):
 
     def roll_back(self) -> None:
         """
-        Undoes the most recent move
+        Undoes the most recent move. Only the squares touched by that move
+        are restored, so this is much cheaper than copying the game.
         
         Parameters: none beyond self
         Returns: nothing
         """
-        recent_move = self._moves.pop()
-
-        trn, mv = recent_move
+        trn, first_two, pos, taken = self._moves.pop()
         self._turn = trn
+        self.first_two = first_two
         
         if self._done:
             self._done = False
             self._outcome = []
 
-
-        if len(mv) == 1:
-            self.first_two = True
-
-
-        for square in mv:
-            pos, player = square
-            if player > 0:
-                self._board.update_piece(pos, player)
-            else:
-                self._board.remove_piece(pos)
+        self._board.unplay(trn, pos, taken)
 
 
     def simulate_moves(self,
@@ -953,10 +1317,20 @@ class Reversi(ReversiBase):
         the method was called on, reflecting the state
         of the game after applying the provided moves.
         """
-        if type(moves) == Tuple[int, int]:
+        if isinstance(moves, tuple) and moves and isinstance(moves[0], int):
             raise ValueError("Submitted a single tuple instead of a list")
         
-        new_game = deepcopy(self)
-        for move in moves:
-            new_game.apply_move(move)
+        # The moves are made on this game and then rolled back, so only the
+        # final position is copied
+        done, outcome = self._done, self._outcome
+        applied = 0
+        try:
+            for move in moves:
+                self.apply_move(move)
+                applied += 1
+            new_game = deepcopy(self)
+        finally:
+            for _ in range(applied):
+                self.roll_back()
+            self._done, self._outcome = done, outcome
         return new_game
\ No newline at end of file
@@ -514,3 +514,51 @@ def test_simulate_moves_4():
     with pytest.raises(ValueError):
         reversi = ReversiMock(side=7, players=2, othello=True)
         future_reversi = reversi.simulate_moves([(8, 8)])
+
+
+def test_load_game_moves_1():
+    """
+    Test that the available moves are worked out again after
+    loading a game
+    """
+    reversi = ReversiMock(side=4, players=2, othello=False)
+
+    assert set(reversi.available_moves) == {(0, 0), (3, 3)}
+
+    reversi.load_game(1, [[None, None, None, None],
+                          [None, 1, None, None],
+                          [None, None, None, None],
+                          [None, None, None, None]])
+
+    assert reversi.legal_move((1, 2))
+    assert set(reversi.available_moves) == {
+        (0, 0), (0, 1), (0, 2), (1, 0), (1, 2), (2, 0), (2, 1), (2, 2), (3, 3)
+    }
+
+
+def test_load_game_invalid_1():
+    """
+    Test that loading a grid with a player that isn't in the game
+    raises a ValueError and leaves the game unchanged
+    """
+    reversi = ReversiMock(side=4, players=2, othello=True)
+    grid_orig = reversi.grid
+
+    with pytest.raises(ValueError):
+        reversi.load_game(1, [[None, None, None, None],
+                              [None, 1, 3, None],
+                              [None, 2, 1, None],
+                              [None, None, None, None]])
+
+    assert reversi.grid == grid_orig
+
+
+def test_simulate_moves_5():
+    """
+    Test that passing simulate_moves a single position instead of
+    a list of positions raises a ValueError exception.
+    """
+    reversi = ReversiMock(side=8, players=2, othello=True)
+
+    with pytest.raises(ValueError):
+        reversi.simulate_moves((3, 5))
@@ -1086,3 +1086,155 @@ def test_winner_7():
                 assert reversi.piece_at(piece) == player
     assert reversi.done
     assert reversi.outcome == [1]
+
+
+def test_winner_8():
+    """
+    Test that ending a game more than once doesn't add players to the
+    outcome again
+    """
+    reversi = Reversi(side=8, players=2, othello=True)
+    reversi.load_game(1, np.zeros((8, 8)))
+
+    reversi.check_for_dead_moves()
+    reversi.check_for_dead_moves()
+
+    assert reversi.done
+    assert reversi.outcome == [1, 2]
+
+
+def test_roll_back_1():
+    """
+    Test that rolling back moves restores the board, the turn and the
+    opening phase of a non-Othello game
+    """
+    reversi = Reversi(side=4, players=2, othello=False)
+    moves = [(1, 1), (1, 2), (2, 2), (2, 1), (1, 3)]
+    grids = []
+
+    for move in moves:
+        grids.append(reversi.grid.copy())
+        reversi.apply_move(move)
+
+    assert not reversi.first_two
+
+    for grid in reversed(grids):
+        reversi.roll_back()
+        assert np.array_equal(reversi.grid, grid)
+
+    assert reversi.first_two
+    assert reversi.turn == 1
+    assert set(reversi.available_moves) == {(1, 1), (1, 2), (2, 1), (2, 2)}
+
+
+def test_piece_count_1():
+    """
+    Test that piece_count tracks the pieces of each player as moves
+    are made and rolled back
+    """
+    reversi = Reversi(side=8, players=2, othello=True)
+
+    assert reversi.piece_count(1) == 2
+    assert reversi.piece_count(2) == 2
+
+    reversi.apply_move((5, 4))
+
+    assert reversi.piece_count(1) == 4
+    assert reversi.piece_count(2) == 1
+
+    reversi.roll_back()
+
+    assert reversi.piece_count(1) == 2
+    assert reversi.piece_count(2) == 2
+
+
+def test_flips_1():
+    """
+    Test that flips reports the pieces a move would flip without
+    changing the game
+    """
+    reversi = Reversi(side=8, players=2, othello=True)
+    grid_orig = reversi.grid
+
+    flipped = reversi.flips((5, 4))
+
+    assert flipped == 1 << (4 * 8 + 4)
+    assert reversi.flips((0, 0)) == 0
+    assert np.array_equal(reversi.grid, grid_orig)
+    assert reversi.turn == 1
+
+
+def test_reset_1():
+    """
+    Test that reset puts a game that has been played back in its
+    starting position
+    """
+    reversi = Reversi(side=8, players=2, othello=True)
+    grid_orig = reversi.grid
+    zhash_orig = reversi.zhash
+
+    reversi.apply_move((5, 4))
+    reversi.apply_move((5, 5))
+    reversi.reset()
+
+    assert np.array_equal(reversi.grid, grid_orig)
+    assert reversi.zhash == zhash_orig
+    assert reversi.turn == 1
+    assert not reversi.done
+    assert reversi.outcome == []
+    assert set(reversi.available_moves) == {(2, 3), (3, 2), (4, 5), (5, 4)}
+
+
+def test_simulate_moves_undo_1():
+    """
+    Test that simulate_moves leaves the original game exactly as it was,
+    and that the simulated game can roll its moves back
+    """
+    reversi = Reversi(side=8, players=2, othello=True)
+    reversi.apply_move((5, 4))
+    grid_orig = reversi.grid
+    zhash_orig = reversi.zhash
+
+    future_reversi = reversi.simulate_moves([(5, 5), (4, 5)])
+
+    assert np.array_equal(reversi.grid, grid_orig)
+    assert reversi.zhash == zhash_orig
+    assert reversi.turn == 2
+
+    future_reversi.roll_back()
+    future_reversi.roll_back()
+
+    assert np.array_equal(future_reversi.grid, grid_orig)
+    assert future_reversi.zhash == zhash_orig
+
+    reversi.roll_back()
+
+    assert future_reversi.piece_count(1) == 4
+
+
+def test_simulate_move_4():
+    """
+    Test that passing simulate_moves a single position instead of
+    a list of positions raises a ValueError exception.
+    """
+    reversi = Reversi(side=8, players=2, othello=True)
+
+    with pytest.raises(ValueError):
+        reversi.simulate_moves((3, 5))
+
+
+def test_grid_read_only_1():
+    """
+    Test that the grid can't be modified, and that a grid taken before a
+    move still shows the position from before the move
+    """
+    reversi = Reversi(side=8, players=2, othello=True)
+    grid = reversi.grid
+
+    with pytest.raises(ValueError):
+        grid[0][0] = 1
+
+    reversi.apply_move((2, 3))
+
+    assert grid[2][3] == 0
+    assert reversi.grid[2][3] == 1